@@ -1,6 +1,7 @@
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncpg
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 
 DATABASE_URL = os.environ.get('DATABASE_URL')
@@ -15,17 +16,79 @@ else:
     elif DATABASE_URL.startswith('postgres://'):
         DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql+asyncpg://', 1)
 
-engine = create_async_engine(DATABASE_URL, future=True, echo=False)
-AsyncSessionLocal = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+# plain DSN for asyncpg (it doesn't understand the SQLAlchemy driver suffix)
+ASYNCPG_DSN = DATABASE_URL.replace('postgresql+asyncpg://', 'postgresql://', 1)
+
+# SQLAlchemy's defaults (5 + 10 overflow) lock up under concurrent API load
+engine = create_async_engine(
+    DATABASE_URL,
+    future=True,
+    echo=False,
+    pool_size=int(os.environ.get('DB_POOL_SIZE', 20)),
+    max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 40)),
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
 
 
+# articles.content is zlib-compressed bytea (models.pack_content); create_all
+# never alters an existing table, so convert a pre-compression TEXT column in place
+_CONTENT_BYTEA_MIGRATION = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'articles'
+                 AND column_name = 'content' AND data_type = 'text') THEN
+        ALTER TABLE articles ALTER COLUMN content TYPE bytea USING convert_to(content, 'UTF8');
+    END IF;
+END $$;
+"""
+
+
+# created_at used to be a naive UTC timestamp filled in by Python; inserts now
+# rely on the server default, which an existing column doesn't have
+_CREATED_AT_MIGRATION = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'articles'
+                 AND column_name = 'created_at' AND data_type = 'timestamp without time zone') THEN
+        ALTER TABLE articles ALTER COLUMN created_at TYPE timestamptz USING created_at AT TIME ZONE 'UTC';
+    END IF;
+    ALTER TABLE articles ALTER COLUMN created_at SET DEFAULT now();
+    UPDATE articles SET created_at = now() WHERE created_at IS NULL;
+    ALTER TABLE articles ALTER COLUMN created_at SET NOT NULL;
+END $$;
+"""
+
+# Indexes from models.Article; create_all skips them on an existing table.
+# A lone status index is redundant next to the (status, created_at) one.
+_INDEX_MIGRATIONS = (
+    "CREATE INDEX IF NOT EXISTS ix_articles_status_created ON articles (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_articles_created_at ON articles (created_at)",
+    "DROP INDEX IF EXISTS ix_articles_status",
+)
+
+# In-place upgrades for tables created by older versions: idempotent, one
+# statement each (asyncpg prepares them, so no multi-statement strings)
+_MIGRATIONS = (_CONTENT_BYTEA_MIGRATION, _CREATED_AT_MIGRATION, *_INDEX_MIGRATIONS)
+
+
 async def init_db():
-    """Create DB tables (run once)."""
+    """Create DB tables (run once); also upgrades tables from older versions."""
     from sqlalchemy import text
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            for migration in _MIGRATIONS:
+                await conn.execute(text(migration))
         print("✅ DB initialized")
     except SQLAlchemyError as e:
-        print(f"❌ DB init failed: {e}")
\ No newline at end of file
+        print(f"❌ DB init failed: {e}")
+
+
+async def create_pool() -> asyncpg.Pool:
+    """Raw asyncpg pool for hot read paths that don't need the ORM."""
+    return await asyncpg.create_pool(ASYNCPG_DSN, min_size=5, max_size=20, command_timeout=60)
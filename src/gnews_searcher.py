@@ -1,10 +1,106 @@
+import functools
 import logging
-from typing import List, Dict
+import os
+import shelve
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from gnews import GNews
 import re
 
 logger = logging.getLogger(__name__)
 
+# On-disk memo of resolved Google News links, shared across pipeline runs
+CACHE_PATH = os.environ.get('GNEWS_CACHE_PATH', os.path.join('.cache', 'gnews'))
+CACHE_TTL = 86400
+_cache_lock = threading.Lock()
+
+# Tracking params that never change the article itself (matched within a query string)
+_TRACKING_RE = re.compile(r'(?:^|&)(?:utm_[^=&]*|gclid|fbclid)=[^&]*')
+
+# Topic searches are memoized in-process for NEWS_CACHE_TTL seconds
+NEWS_CACHE_TTL = 300
+
+
+def _cache_get(key: str):
+    with _cache_lock:
+        try:
+            with shelve.open(CACHE_PATH) as db:
+                entry = db.get(key)
+        except Exception as e:
+            logger.debug(f"GNews cache read failed: {e}")
+            return None
+    if entry and time.time() - entry[0] < CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _cache_set(key: str, value) -> None:
+    with _cache_lock:
+        try:
+            os.makedirs(os.path.dirname(CACHE_PATH) or '.', exist_ok=True)
+            with shelve.open(CACHE_PATH) as db:
+                db[key] = (time.time(), value)
+        except Exception as e:
+            logger.debug(f"GNews cache write failed: {e}")
+
+
+def resolve_url(google_news: GNews, gn_url: str) -> Optional[Tuple[str, Optional[str], str]]:
+    """
+    Resolve a Google News redirect link to (real_url, title, text).
+    Results are cached on disk for CACHE_TTL seconds; returns None if the
+    article could not be resolved. Fetch errors are raised to the caller.
+    """
+    cached = _cache_get(gn_url)
+    if cached is not None:
+        return cached
+
+    full = google_news.get_full_article(gn_url)
+    if not (full and getattr(full, 'url', None)):
+        return None
+
+    resolved = (full.url, getattr(full, 'title', None) or None, getattr(full, 'text', '') or '')
+    _cache_set(gn_url, resolved)
+    return resolved
+
+
+def canonicalize_url(url: str) -> str:
+    """Strip utm_* / click-tracking query params so aliased links compare equal."""
+    base, sep, rest = url.partition('?')
+    if not sep:
+        return url
+    query, hash_sep, fragment = rest.partition('#')
+    query = _TRACKING_RE.sub('', query).lstrip('&')
+    return base + ('?' + query if query else '') + hash_sep + fragment
+
+
+class _NoResults(Exception):
+    """Raised instead of returning [] so lru_cache doesn't memoize it."""
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_get_news(topic: str, language: str, country: str, max_results: int, bucket: int) -> tuple:
+    # `bucket` only exists to expire entries once the TTL window rolls over
+    google_news = GNews(language=language, country=country, max_results=max_results)
+    items = tuple(google_news.get_news(topic) or ())
+    if not items:
+        # GNews returns [] on fetch errors too: don't pin that for the window
+        raise _NoResults()
+    return items
+
+
+def get_news(topic: str, language: str = 'en', country: str = 'US', max_results: int = 5) -> List[Dict]:
+    """Google News search for a topic; non-empty results are cached for NEWS_CACHE_TTL seconds."""
+    bucket = int(time.time() // NEWS_CACHE_TTL)
+    try:
+        items = _cached_get_news(topic, language, country, max_results, bucket)
+    except _NoResults:
+        return []
+    # hand out copies: callers rewrite item['url'] in place
+    return [dict(item) for item in items]
+
+
 class NewsSearcher:
     """
     Fetches articles using the GNews library (Google News RSS).
@@ -13,27 +109,42 @@ class NewsSearcher:
 
     def __init__(self, topic: str, max_results: int = 5, language: str = 'en', country: str = 'US'):
         self.topic = topic
+        self.max_results = max_results
+        self.language = language
+        self.country = country
         self.google_news = GNews(language=language, country=country, max_results=max_results)
 
     def search(self) -> List[Dict]:
         """Returns list of dicts with keys: title, published date, url, publisher, etc."""
         try:
             logger.info(f"📰 Searching Google News for: {self.topic}")
-            news_results = self.google_news.get_news(self.topic)
+            news_results = get_news(self.topic, self.language, self.country, self.max_results)
             
             # Extract real URLs from redirect links
+            # GNews returns articles with redirect URLs; get_full_article resolves
+            # them but is a blocking fetch, so overlap the lookups in a thread pool
+            def fetch_full(url):
+                try:
+                    return resolve_url(self.google_news, url)
+                except Exception as e:
+                    return e
+
             cleaned_results = []
-            for item in news_results:
-                # GNews returns articles with redirect URLs
-                # We need to get the actual article using get_full_article
+            if news_results:
+                with ThreadPoolExecutor(max_workers=min(10, len(news_results))) as ex:
+                    fulls = list(ex.map(fetch_full, [i['url'] for i in news_results]))
+            else:
+                fulls = []
+
+            for item, full_article in zip(news_results, fulls):
                 try:
-                    # Get full article which includes the real URL
-                    full_article = self.google_news.get_full_article(item['url'])
-                    
-                    if full_article and hasattr(full_article, 'url'):
+                    if isinstance(full_article, Exception):
+                        raise full_article
+
+                    if full_article:
                         # Use the real URL from the full article
-                        item['url'] = full_article.url
-                        item['text'] = full_article.text if hasattr(full_article, 'text') else ''
+                        real_url, _, item['text'] = full_article
+                        item['url'] = canonicalize_url(real_url)
                         cleaned_results.append(item)
                         logger.info(f"  ✅ Got article: {item.get('title', 'No title')[:60]}...")
                     else:
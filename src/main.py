@@ -1,13 +1,23 @@
-import os
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Optional
 from .run_pipeline import run_pipeline
-from .db import AsyncSessionLocal, init_db
+from .scraper import close_scraper
+from .summarizer import close_summarizer
+from .db import AsyncSessionLocal, init_db, create_pool
 from .models import Article
+from .video_provider import build_did_payload, generate_video, close_heygen_client, resolve_callback, verify_callback_token
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
 
-app = FastAPI(title='News-to-Avatar Pipeline')
+app = FastAPI(title='News-to-Avatar Pipeline', default_response_class=ORJSONResponse)
+
+# Columns exposed by GET /articles (content is deliberately left out)
+_ARTICLE_FIELDS = ('id', 'title', 'url', 'summary', 'script', 'video_url', 'status', 'created_at')
+_ARTICLES_SQL = f"SELECT {', '.join(_ARTICLE_FIELDS)} FROM articles LIMIT $1"
+ARTICLES_MAX_LIMIT = 500
 
 class RunResponse(BaseModel):
     message: str
@@ -17,6 +27,17 @@ class RunResponse(BaseModel):
 async def startup():
     # Ensure DB is initialized (no-op if already exists)
     await init_db()
+    app.state.pool = await create_pool()
+
+
+@app.on_event('shutdown')
+async def shutdown():
+    pool = getattr(app.state, 'pool', None)
+    if pool is not None:
+        await pool.close()
+    await close_scraper()
+    await close_summarizer()
+    await close_heygen_client()
 
 
 @app.post('/run_pipeline', response_model=RunResponse)
@@ -29,28 +50,13 @@ async def run_pipeline_endpoint(topic: str = Query('technology'), limit: int = Q
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get('/articles', response_model=List[dict])
-async def get_articles(limit: int = 50):
-    async with AsyncSessionLocal() as session:
-        q = select(Article).limit(limit)
-        res = await session.execute(q)
-        rows = res.scalars().all()
-        out = []
-        for r in rows:
-            out.append({
-                'id': r.id,
-                'title': r.title,
-                'url': r.url,
-                'summary': r.summary,
-                'script': r.script,
-                'video_url': r.video_url,
-                'status': r.status,
-                'created_at': r.created_at.isoformat() if r.created_at else None
-            })
-        return out
-
-from .video_provider import build_did_payload, generate_video
-from sqlalchemy import update
+@app.get('/articles')
+async def get_articles(limit: int = Query(50, ge=1, le=ARTICLES_MAX_LIMIT)):
+    # read-only listing over the raw pool: rows are fetched before the response
+    # starts, so a slow client never holds a connection (and a DB error is a
+    # proper 500 instead of a truncated 200 body)
+    rows = await app.state.pool.fetch(_ARTICLES_SQL, limit)
+    return ORJSONResponse([dict(r) for r in rows])
 
 
 @app.post('/init-db')
@@ -63,10 +69,13 @@ async def init_db_endpoint():
 
 
 @app.post('/generate-video/{article_id}')
-async def generate_video_endpoint(article_id: int, model: str = 'expressive'):
+async def generate_video_endpoint(article_id: int, model: str = 'expressive', voice: Optional[str] = None):
     """Generate an avatar video for the given article ID using the configured provider."""
     async with AsyncSessionLocal() as session:
-        q = select(Article).where(Article.id == article_id)
+        # only the columns this endpoint touches; skips the (large) content blob
+        q = select(Article).where(Article.id == article_id).options(
+            load_only(Article.id, Article.script, Article.status, Article.video_url)
+        )
         res = await session.execute(q)
         article = res.scalar_one_or_none()
         if not article:
@@ -74,7 +83,10 @@ async def generate_video_endpoint(article_id: int, model: str = 'expressive'):
         if not article.script:
             raise HTTPException(status_code=400, detail='Article has no script to convert to video')
 
-        payload = build_did_payload(article.script, model=model)
+        try:
+            payload = build_did_payload(article.script, model=model, voice=voice)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         try:
             resp = await generate_video(payload)
             # provider-specific: try common keys
@@ -86,3 +98,18 @@ async def generate_video_endpoint(article_id: int, model: str = 'expressive'):
             return {'article_id': article.id, 'video_url': video_url, 'raw_response': resp}
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post('/webhooks/heygen')
+async def heygen_webhook(request: Request, token: str = Query('')):
+    """HeyGen job callback (HEYGEN_CALLBACK_URL); wakes the matching generate_video call."""
+    if not verify_callback_token(token):
+        raise HTTPException(status_code=403, detail='Invalid webhook token')
+    # the waiting future lives in this process, so run a single worker in callback mode
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail='Invalid JSON body')
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail='Expected a JSON object')
+    return {'matched': resolve_callback(body)}
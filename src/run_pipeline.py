@@ -1,35 +1,41 @@
 import asyncio
-import os
 import argparse
 import logging
+import logging.handlers
+import queue
 import sys
-from typing import List
+
+from gnews import GNews
+from sqlalchemy import insert
+
+from .gnews_searcher import get_news, resolve_url, canonicalize_url
+from .scraper import scrape_urls, close_scraper
+from .summarizer import summarize_article, generate_script, close_summarizer
+from .db import AsyncSessionLocal
+from .models import Article, pack_content
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT transaction when saving processed articles
+SAVE_BATCH_SIZE = 10
+
 async def run_pipeline(topic: str, limit: int = 5, use_playwright: bool = True):
     """
     Run the complete news-to-script pipeline
     """
-    from gnews import GNews
-    from .scraper import scrape_urls
-    from .summarizer import summarize_article, generate_script
-    from .db import AsyncSessionLocal
-    from .models import Article
-
-    print(f"🔎 Searching news for: {topic}")
+    logger.info(f"🔎 Searching news for: {topic}")
 
     google_news = GNews(language='en', country='US', max_results=limit)
 
     try:
-        news_items = google_news.get_news(topic)
-        print(f"📰 Found {len(news_items)} news articles")
+        news_items = get_news(topic, 'en', 'US', limit)
+        logger.info(f"📰 Found {len(news_items)} news articles")
     except Exception as e:
-        print(f"❌ GNews search failed: {e}")
+        logger.error(f"❌ GNews search failed: {e}")
         return
 
     if not news_items:
-        print("⚠️  No articles found for this topic")
+        logger.warning("⚠️  No articles found for this topic")
         return
 
     # ─── IMPORTANT CHANGE: Resolve real URLs ────────────────────────────────
@@ -37,93 +43,138 @@ async def run_pipeline(topic: str, limit: int = 5, use_playwright: bool = True):
     url_to_title = {}
     url_to_gnews_item = {}
 
+    # get_full_article is a blocking fetch, so run the lookups in threads
+    # and overlap them (bounded, to stay polite to the publishers).
+    resolve_sem = asyncio.Semaphore(10)
+
+    async def resolve(gn_url: str):
+        async with resolve_sem:
+            return await asyncio.to_thread(resolve_url, google_news, gn_url)
+
+    # GNews often returns the same link more than once for a topic
+    items = []
+    seen = set()
     for item in news_items:
         gn_url = item.get('url') or item.get('link')
-        if not gn_url:
-            continue
+        if gn_url and gn_url not in seen:
+            seen.add(gn_url)
+            items.append((item, gn_url))
+    results = await asyncio.gather(*(resolve(gn_url) for _, gn_url in items), return_exceptions=True)
 
+    for (item, gn_url), full in zip(items, results):
         title = item.get('title', 'No title')
 
         real_url = gn_url
-        try:
-            full = google_news.get_full_article(gn_url)
-            if full and hasattr(full, 'url') and full.url:
-                real_url = full.url
-                if hasattr(full, 'title') and full.title:
-                    title = full.title
-            print(f"  → Resolved: {real_url[:90]}...")
-        except Exception as e:
-            print(f"  ⚠️ get_full_article failed for {gn_url[:60]}... → {e}")
+        if isinstance(full, Exception):
+            logger.warning(f"  ⚠️ get_full_article failed for {gn_url[:60]}... → {full}")
+        else:
+            if full:
+                real_url, full_title, _ = full
+                if full_title:
+                    title = full_title
+            logger.info(f"  → Resolved: {real_url[:90]}...")
+
+        # different redirect links can land on the same article
+        real_url = canonicalize_url(real_url)
+        if real_url in url_to_title:
+            logger.info(f"  ↩️ Duplicate, skipping: {real_url[:90]}...")
+            continue
 
         urls.append(real_url)
         url_to_title[real_url] = title
         url_to_gnews_item[real_url] = item
 
-    print(f"✅ Got {len(urls)} resolved article URLs")
+    logger.info(f"✅ Got {len(urls)} resolved article URLs")
 
     # ─── Scrape ──────────────────────────────────────────────────────────────
-    print(f"\n📄 Scraping articles with Playwright (this may take a minute)...")
+    logger.info("📄 Scraping articles with Playwright (this may take a minute)...")
     scrape_results = await scrape_urls(urls, use_playwright=use_playwright)
 
-    # ─── Process and save ────────────────────────────────────────────────────
-    processed_count = 0
+    # ─── Summarize + script (concurrently) ───────────────────────────────────
+    # Each article is two LLM round-trips; overlap them across articles but
+    # cap in-flight requests to stay under the provider's rate limits.
+    llm_sem = asyncio.Semaphore(5)
+    total = len(scrape_results)
+
+    async def process_one(idx: int, scrape_result: dict):
+        final_url = scrape_result['url']
+        status = scrape_result['status']
+        content = scrape_result.get('content', '')
+        title = scrape_result.get('title') or url_to_title.get(final_url, 'No title')
+        tag = f"[{idx}/{total}]"
+
+        logger.info(f"{tag} {title[:65]}...")
+
+        if status != 'success' or len(content) < 300:
+            error = scrape_result.get('error', 'Unknown reason')
+            logger.warning(f"  {tag} ❌ Skipping: {error}")
+            return None
+
+        logger.info(f"  {tag} ✅ Scraped: {len(content):,} chars")
+        if final_url != urls[idx-1]:
+            logger.info(f"  {tag} 🔗 Final URL: {final_url[:90]}...")
+
+        async with llm_sem:
+            logger.info(f"  {tag} ⏳ Summarizing...")
+            summary = await summarize_article(content)
+
+            logger.info(f"  {tag} ⏳ Generating script...")
+            script = await generate_script(title, summary)
+
+        preview = script[:140].replace('\n', ' ')
+        logger.info(f"  {tag} 📝 Script preview: {preview}...")
+
+        return {
+            'title': title,
+            'url': final_url,
+            'content': pack_content(content[:15000]),
+            'summary': summary,
+            'script': script,
+            'status': 'ready',
+        }
+
+    results = await asyncio.gather(
+        *(process_one(idx, sr) for idx, sr in enumerate(scrape_results, 1)),
+        return_exceptions=True,
+    )
+
+    articles = []
+    for idx, result in enumerate(results, 1):
+        if isinstance(result, Exception):
+            logger.error(f"  [{idx}/{total}] ❌ Processing error: {result}")
+            logger.error(f"Article {idx} failed", exc_info=result)
+        elif result:
+            articles.append(result)
+
+    # ─── Save ────────────────────────────────────────────────────────────────
+    # Short transactions of SAVE_BATCH_SIZE rows: a bad row only loses its own
+    # batch, and no single transaction stays open for the whole save.
+    saved = 0
     async with AsyncSessionLocal() as session:
-        for idx, scrape_result in enumerate(scrape_results, 1):
-            final_url = scrape_result['url']
-            status = scrape_result['status']
-            content = scrape_result.get('content', '')
-            title = scrape_result.get('title') or url_to_title.get(final_url, 'No title')
-
-            print(f"\n{'='*70}")
-            print(f"[{idx}/{len(scrape_results)}] {title[:65]}...")
-            print(f"{'='*70}")
-
-            if status != 'success' or len(content) < 300:
-                error = scrape_result.get('error', 'Unknown reason')
-                print(f"  ❌ Skipping: {error}")
-                continue
-
-            print(f"  ✅ Scraped: {len(content):,} chars")
-            if final_url != urls[idx-1]:
-                print(f"  🔗 Final URL: {final_url[:90]}...")
-
+        for start in range(0, len(articles), SAVE_BATCH_SIZE):
+            batch = articles[start:start + SAVE_BATCH_SIZE]
             try:
-                print(f"  ⏳ Summarizing...")
-                summary = await summarize_article(content)
-
-                print(f"  ⏳ Generating script...")
-                script = await generate_script(title, summary)
-
-                print(f"  📝 Script preview: {script[:140].replace('\n',' ')}...")
-
-                article = Article(
-                    title=title,
-                    url=final_url,
-                    content=content[:15000],
-                    summary=summary,
-                    script=script,
-                    status='ready'
-                )
-                session.add(article)
-                processed_count += 1
-                print(f"  💾 Saved")
-
+                async with session.begin():
+                    await session.execute(insert(Article), batch)
+                saved += len(batch)
             except Exception as e:
-                print(f"  ❌ Processing error: {e}")
-                logger.error(f"Article {idx} failed", exc_info=True)
+                logger.error(f"❌ Commit failed for rows {start + 1}-{start + len(batch)}: {e}")
 
-        try:
-            await session.commit()
-            print(f"\n{'='*70}")
-            print(f"✅ PIPELINE COMPLETED — {processed_count}/{len(scrape_results)} saved")
-            print(f"{'='*70}\n")
-        except Exception as e:
-            print(f"❌ Commit failed: {e}")
+    logger.info('=' * 70)
+    logger.info(f"✅ PIPELINE COMPLETED — {saved}/{total} saved")
+    logger.info('=' * 70)
 
 # ─── CLI / Windows compatibility ────────────────────────────────────────────
 
 if __name__ == '__main__':
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Log records go through a queue; a background listener does the actual
+    # stderr writes so the event loop never blocks on console I/O
+    log_queue = queue.Queue(-1)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, console)
+    logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+    listener.start()
 
     parser = argparse.ArgumentParser()
     parser.add_argument('--topic', type=str, default='technology')
@@ -133,10 +184,27 @@ if __name__ == '__main__':
 
     use_pw = not args.no_playwright
 
-    if sys.platform == 'win32':
-        print("🔧 Windows: using ProactorEventLoop")
-        loop = asyncio.ProactorEventLoop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(run_pipeline(args.topic, args.limit, use_playwright=use_pw))
-    else:
-        asyncio.run(run_pipeline(args.topic, args.limit, use_playwright=use_pw))
\ No newline at end of file
+    async def main():
+        try:
+            await run_pipeline(args.topic, args.limit, use_playwright=use_pw)
+        finally:
+            await close_scraper()
+            await close_summarizer()
+
+    try:
+        if sys.platform == 'win32':
+            logger.info("🔧 Windows: using ProactorEventLoop")
+            loop = asyncio.ProactorEventLoop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(main())
+        else:
+            try:
+                import uvloop  # ships with uvicorn[standard]
+                uvloop.install()
+                logger.info("🔧 Using uvloop event loop")
+            except ImportError:
+                pass
+            asyncio.run(main())
+    finally:
+        # flush whatever is still queued
+        listener.stop()
@@ -1,9 +1,30 @@
 import asyncio
-from typing import List, Dict
+import concurrent.futures
+import hashlib
+import json
+import multiprocessing
+import os
+import pathlib
+import re
+import shutil
+import time
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Successful scrapes are cached on disk, one JSON file per URL (file I/O runs
+# in worker threads so cache hits don't stall the other scrapes)
+SCRAPE_CACHE_DIR = os.environ.get('SCRAPE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'scraper'))
+SCRAPE_CACHE_TTL = int(os.environ.get('SCRAPE_CACHE_TTL', 86400))
+
+# Hosts that only render article text with JavaScript: go straight to Playwright
+JS_REQUIRED_HOSTS = frozenset({'news.google.com', 'twitter.com', 'x.com', 'medium.com'})
+
+# Max Playwright pages open at once in scrape_urls
+SCRAPE_CONCURRENCY = int(os.environ.get('SCRAPE_CONCURRENCY', 8))
+
 try:
     from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
@@ -13,16 +34,134 @@ except ImportError:
 
 try:
     import trafilatura
-    import requests
     TRAFILATURA_AVAILABLE = True
 except ImportError:
     TRAFILATURA_AVAILABLE = False
 
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import hishel
+    HISHEL_AVAILABLE = True
+except ImportError:
+    HISHEL_AVAILABLE = False
+
+import httpx
+import orjson
 from bs4 import BeautifulSoup
 
+# Whitespace collapser for extracted text (one C-level pass, no token list)
+_WS = re.compile(r'\s+')
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36'
+
+# RFC 9111 response cache for the fallbacks (Cache-Control/ETag/Last-Modified,
+# so stale pages are revalidated with a conditional GET instead of refetched)
+HTTP_CACHE_DIR = os.environ.get('HTTP_CACHE_DIR', '.hishel')
+
+# Shared client for the non-browser fallbacks: keeps TLS sessions warm and
+# multiplexes requests to the same host over HTTP/2. Built lazily inside the
+# running event loop; close_scraper() tears it down.
+_HTTP: Optional[httpx.AsyncClient] = None
+
+
+def _get_http() -> httpx.AsyncClient:
+    global _HTTP
+    if _HTTP is None or _HTTP.is_closed:
+        kwargs = dict(
+            http2=True,
+            headers={'User-Agent': USER_AGENT},
+            timeout=15,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        )
+        if HISHEL_AVAILABLE:
+            _HTTP = hishel.AsyncCacheClient(
+                storage=hishel.AsyncFileStorage(base_path=pathlib.Path(HTTP_CACHE_DIR)),
+                **kwargs,
+            )
+        else:
+            _HTTP = httpx.AsyncClient(**kwargs)
+    return _HTTP
 
-async def scrape_url(url: str, use_playwright: bool = True) -> Dict:
-    item = {"url": url, "title": None, "content": "", "status": "failed", "error": None}
+
+def _cache_path(url: str) -> str:
+    key = hashlib.blake2b(url.encode('utf-8'), digest_size=20).hexdigest()
+    return os.path.join(SCRAPE_CACHE_DIR, f"{key}.json")
+
+
+def _read_cached(url: str) -> Optional[Dict]:
+    path = _cache_path(url)
+    try:
+        if time.time() - os.path.getmtime(path) > SCRAPE_CACHE_TTL:
+            return None
+        with open(path, 'rb') as f:
+            result = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    return result if result.get('status') == 'success' else None
+
+
+def _write_cached(url: str, result: Dict) -> None:
+    path = _cache_path(url)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(SCRAPE_CACHE_DIR, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(result))
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug(f"Scrape cache write failed for {url}: {e}")
+
+
+# one lock per URL so concurrent duplicates wait for a single fetch; entries
+# are dropped once nobody holds or waits on them (the API process is long-lived)
+_url_locks: Dict[str, asyncio.Lock] = {}
+_url_lock_users: Dict[str, int] = {}
+
+
+async def scrape_url(url: str, use_playwright: bool = True, cache_bypass: bool = False) -> Dict:
+    """
+    Scrape one URL, reusing a cached successful result younger than
+    SCRAPE_CACHE_TTL. URLs are cached as given, so pass canonical ones.
+    """
+    lock = _url_locks.setdefault(url, asyncio.Lock())
+    _url_lock_users[url] = _url_lock_users.get(url, 0) + 1
+    try:
+        async with lock:
+            if not cache_bypass:
+                cached = await asyncio.to_thread(_read_cached, url)
+                if cached:
+                    logger.info(f"  💾 Cache hit: {url[:80]}")
+                    return cached
+
+            result = await _scrape_url_uncached(url, use_playwright)
+            if result['status'] == 'success':
+                await asyncio.to_thread(_write_cached, url, result)
+            return result
+    finally:
+        _url_lock_users[url] -= 1
+        if not _url_lock_users[url]:
+            del _url_lock_users[url]
+            del _url_locks[url]
+
+
+def _needs_js(url: str) -> bool:
+    host = (urlparse(url).hostname or '').lower()
+    return any(host == d or host.endswith('.' + d) for d in JS_REQUIRED_HOSTS)
+
+
+async def _scrape_url_uncached(url: str, use_playwright: bool) -> Dict:
+    # Static pages: a plain GET + trafilatura takes milliseconds, Playwright seconds
+    static_result = None
+    if TRAFILATURA_AVAILABLE and not _needs_js(url):
+        static_result = await _scrape_with_trafilatura(url)
+        if static_result['status'] == 'success' and len(static_result['content']) >= 500:
+            return static_result
 
     if PLAYWRIGHT_AVAILABLE and use_playwright:
         result = await _scrape_with_playwright(url)
@@ -31,120 +170,232 @@ async def scrape_url(url: str, use_playwright: bool = True) -> Dict:
         logger.info(f"  ⚠️ Playwright weak ({len(result['content'])} chars) → fallback")
 
     if TRAFILATURA_AVAILABLE:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(None, lambda: _scrape_with_trafilatura(url))
-        if result['status'] == 'success' and len(result['content']) >= 300:
-            return result
-
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(None, lambda: _scrape_with_beautifulsoup(url))
-    return result
+        if static_result is None:
+            static_result = await _scrape_with_trafilatura(url)
+        if static_result['status'] == 'success' and len(static_result['content']) >= 300:
+            return static_result
+
+    return await _scrape_with_html_parser(url)
+
+
+# Persistent profile so Chromium's HTTP disk cache survives between pages and runs.
+# Chromium locks a profile to one process: if it's taken (CLI next to the API,
+# several workers), this process falls back to a private "<dir>-<pid>" copy.
+PLAYWRIGHT_PROFILE_DIR = os.environ.get('PLAYWRIGHT_PROFILE_DIR', './.pw-profile')
+
+# Only text is extracted, so never download these. Blocked via CDP URL patterns
+# rather than page.route(): Playwright turns the HTTP cache off while routing.
+_BLOCKED_EXTENSIONS = (
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico',  # images
+    'mp4', 'webm', 'm3u8', 'mp3',                               # media
+    'woff', 'woff2', 'ttf', 'otf',                              # fonts
+    'css',                                                      # stylesheets
+)
+_BLOCKED_HOSTS = (
+    'doubleclick.net', 'googlesyndication.com', 'google-analytics.com', 'googletagmanager.com',
+    'adservice.google.', 'amazon-adsystem.com', 'scorecardresearch.com', 'facebook.net',
+    'taboola.com', 'outbrain.com', 'chartbeat.com', 'chartbeat.net', 'hotjar.com',
+)
+_BLOCKED_URL_PATTERNS = (
+    [f'*.{ext}' for ext in _BLOCKED_EXTENSIONS]
+    + [f'*.{ext}?*' for ext in _BLOCKED_EXTENSIONS]
+    + [f'*{host}*' for host in _BLOCKED_HOSTS]
+)
+
+
+# Any of these showing up means the article body has rendered
+ARTICLE_READY_SELECTOR = 'article, main, [itemprop="articleBody"], [data-testid*="body" i]'
+
+# Article containers to try in order (modern selectors 2025–2026), then a
+# paragraph fallback. Runs entirely in the page; returns the raw text.
+EXTRACT_JS = """() => {
+    const sels = %s;
+    const clean = (t) => (t || '').replace(/\\s+/g, ' ').trim();
+    for (const s of sels) {
+        const el = document.querySelector(s);
+        if (el && clean(el.innerText).length > 400) return el.innerText;
+    }
+    const ps = [...document.querySelectorAll(%s)]
+        .map((e) => (e.innerText || '').trim())
+        .filter((t) => t.length > 25);
+    return ps.join('\\n\\n');
+}""" % (
+    json.dumps([
+        'article',
+        'main',
+        '[data-testid="article-body"], [data-testid="body"]',
+        'div[class*="RichText" i], .rich-text, [class*="article-body" i]',
+        'div[class*="content" i][class*="body" i]',
+        '[itemprop="articleBody"]',
+        'section[data-qa*="body" i], .story-body, .entry-content',
+    ]),
+    json.dumps('p, div[class*="para" i], div[class*="text" i], article div:not([class*="ad" i])'),
+)
+
+
+async def _new_page(context):
+    """Open a page with the blocklist applied and the HTTP cache left on."""
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send('Network.enable')
+    await cdp.send('Network.setCacheDisabled', {'cacheDisabled': False})
+    await cdp.send('Network.setBlockedURLs', {'urls': _BLOCKED_URL_PATTERNS})
+    return page
+
+
+class _PlaywrightPool:
+    """
+    One persistent Chromium context shared by every scrape; each URL gets
+    its own page instead of paying a browser cold start.
+
+    Rendered pages are cached and revalidated (ETag/Last-Modified) by
+    Chromium's own disk cache in the profile. Don't add context/page.route()
+    handlers: Playwright disables that cache while any route is active.
+    """
+
+    def __init__(self):
+        self._playwright = None
+        self._context = None
+        self._lock = None
+        self._private_profile = None
+
+    async def get_context(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._context is None:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                try:
+                    context = await self._launch(PLAYWRIGHT_PROFILE_DIR)
+                except Exception as e:
+                    # most likely another process holds the profile lock
+                    self._private_profile = f"{PLAYWRIGHT_PROFILE_DIR.rstrip('/')}-{os.getpid()}"
+                    logger.warning(f"⚠️ Playwright profile {PLAYWRIGHT_PROFILE_DIR} unavailable ({e}); using {self._private_profile}")
+                    context = await self._launch(self._private_profile)
+                context.on('close', lambda _: setattr(self, '_context', None))
+                self._context = context
+            return self._context
+
+    async def _launch(self, profile_dir: str):
+        return await self._playwright.chromium.launch_persistent_context(
+            profile_dir,
+            headless=True,
+            args=["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"],
+            user_agent=USER_AGENT,
+            viewport={'width': 1280, 'height': 900},
+        )
+
+    async def shutdown(self):
+        if self._context is not None:
+            try:
+                await self._context.close()
+            except Exception:
+                pass
+            self._context = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        if self._private_profile is not None:
+            # per-process copy: nothing else will ever reuse it
+            shutil.rmtree(self._private_profile, ignore_errors=True)
+            self._private_profile = None
+
+
+_pool = _PlaywrightPool()
+
+
+async def close_scraper():
+    """Tear down the shared browser, HTTP client and parser pool (call once at process/app exit)."""
+    global _parse_pool, _HTTP
+    await _pool.shutdown()
+    if _HTTP is not None:
+        await _HTTP.aclose()
+        _HTTP = None
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
 
 
 async def _scrape_with_playwright(url: str, timeout: int = 75000) -> Dict:
     item = {"url": url, "title": None, "content": "", "status": "failed", "error": None}
 
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True, args=[
-                "--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"
-            ])
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
-                viewport={'width': 1280, 'height': 900},
-            )
-            page = await context.new_page()
+        context = await _pool.get_context()
+        page = await _new_page(context)
 
-            try:
-                # ─── Navigation with consent handling ───────────────────────
-                await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+        try:
+            # ─── Navigation with consent handling ───────────────────────
+            await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
 
-                # Try to click Google / cookie consent
+            # Try to click Google / cookie consent
+            try:
+                consent = await page.query_selector(
+                    'button:has-text("Accept all"), button:has-text("I agree"), #L2AGLb, [aria-label*="Accept"], [data-testid*="accept"]'
+                )
+                if consent:
+                    await consent.click(delay=200)
+                    await page.wait_for_timeout(1800)
+                    logger.info("  ℹ️  Consent clicked")
+            except:
+                pass
+
+            # Wait for the article container rather than networkidle: analytics
+            # beacons and sockets on news sites often keep the network busy forever
+            try:
+                await page.wait_for_selector(ARTICLE_READY_SELECTOR, state='attached', timeout=8000)
+            except:
                 try:
-                    consent = await page.query_selector(
-                        'button:has-text("Accept all"), button:has-text("I agree"), #L2AGLb, [aria-label*="Accept"], [data-testid*="accept"]'
-                    )
-                    if consent:
-                        await consent.click(delay=200)
-                        await page.wait_for_timeout(1800)
-                        logger.info("  ℹ️  Consent clicked")
+                    await page.wait_for_load_state('networkidle', timeout=3000)
                 except:
                     pass
 
-                # Wait for content to stabilize
+            item['url'] = page.url
+            item['title'] = await page.title()
+
+            content = ""
+
+            # Rendered HTML snapshot (one CDP call) → trafilatura in the parse pool
+            if TRAFILATURA_AVAILABLE:
                 try:
-                    await page.wait_for_load_state('networkidle', timeout=35000)
+                    extracted, _ = await _run_parser(_traf_extract, await page.content())
+                    content = (extracted or '').strip()
+                except Exception as e:
+                    logger.debug(f"trafilatura on rendered page failed: {e}")
+
+            # Selector + paragraph extraction in a single CDP round-trip
+            if len(content) < 400:
+                try:
+                    extracted = await page.evaluate(EXTRACT_JS)
+                    content = _WS.sub(' ', extracted or '').strip()
+                except Exception:
+                    content = ""
+
+            # Clean body fallback
+            if len(content) < 400:
+                try:
+                    content = await page.evaluate('''() => {
+                        document.querySelectorAll('nav, header, footer, aside, .ad, .banner, .popup, [role="dialog"], [id*="cookie"], .consent').forEach(e => e.remove());
+                        return document.body ? document.body.innerText : '';
+                    }''')
+                    content = _WS.sub(' ', content or '').strip()
                 except:
-                    await page.wait_for_timeout(5000)
-
-                item['url'] = page.url
-                item['title'] = await page.title()
-
-                content = ""
-
-                # Modern selectors 2025–2026
-                selectors = [
-                    'article',
-                    'main',
-                    '[data-testid="article-body"], [data-testid="body"]',
-                    'div[class*="RichText" i], .rich-text, [class*="article-body" i]',
-                    'div[class*="content" i][class*="body" i]',
-                    '[itemprop="articleBody"]',
-                    'section[data-qa*="body" i], .story-body, .entry-content',
-                ]
-
-                for sel in selectors:
-                    try:
-                        el = await page.query_selector(sel)
-                        if el:
-                            txt = await el.inner_text()
-                            cleaned = ' '.join(txt.split())
-                            if len(cleaned) > 400:
-                                content = cleaned
-                                break
-                    except:
-                        continue
-
-                # Paragraph fallback
-                if len(content) < 400:
-                    try:
-                        els = await page.query_selector_all('p, div[class*="para" i], div[class*="text" i], article div:not([class*="ad" i])')
-                        texts = [ (await e.inner_text()).strip() async for e in els if (await e.inner_text()).strip() ]
-                        texts = [t for t in texts if len(t) > 25]
-                        if texts:
-                            content = '\n\n'.join(texts)
-                            content = ' '.join(content.split())
-                    except:
-                        pass
-
-                # Clean body fallback
-                if len(content) < 400:
-                    try:
-                        await page.evaluate('''() => {
-                            document.querySelectorAll('nav, header, footer, aside, .ad, .banner, .popup, [role="dialog"], [id*="cookie"], .consent').forEach(e => e.remove());
-                        }''')
-                        body = await page.query_selector('body')
-                        content = await body.inner_text()
-                        content = ' '.join(content.split())
-                    except:
-                        pass
-
-                content = content.strip()
-                if len(content) >= 300:
-                    item['status'] = 'success'
-                    item['content'] = content
-                    logger.info(f"  ✅ Playwright: {item['title'][:55]}... ({len(content):,} chars)")
-                else:
-                    item['error'] = f"Content too short ({len(content)} chars)"
-
-            except Exception as e:
-                item['error'] = str(e)
-                logger.warning(f"  ❌ Playwright error: {e}")
-
-            finally:
-                await page.close()
-                await context.close()
-                await browser.close()
+                    pass
+
+            content = content.strip()
+            if len(content) >= 300:
+                item['status'] = 'success'
+                item['content'] = content
+                logger.info(f"  ✅ Playwright: {item['title'][:55]}... ({len(content):,} chars)")
+            else:
+                item['error'] = f"Content too short ({len(content)} chars)"
+
+        except Exception as e:
+            item['error'] = str(e)
+            logger.warning(f"  ❌ Playwright error: {e}")
+
+        finally:
+            await page.close()
 
     except Exception as e:
         item['error'] = str(e)
@@ -152,38 +403,108 @@ async def _scrape_with_playwright(url: str, timeout: int = 75000) -> Dict:
     return item
 
 
-def _scrape_with_trafilatura(url: str) -> Dict:
+# HTML extraction is CPU-bound pure Python; run it in worker processes so it
+# neither blocks the event loop nor fights the GIL with other scrapes. Each
+# call pickles the page HTML across (~0.5 ms per 500 KB), which only pays off
+# with more than one core; single-core hosts default to a thread pool.
+SCRAPE_PARSE_POOL = os.environ.get('SCRAPE_PARSE_POOL') or ('process' if (os.cpu_count() or 1) > 1 else 'thread')
+_parse_pool: Optional[concurrent.futures.Executor] = None
+
+
+def _get_parse_pool() -> concurrent.futures.Executor:
+    global _parse_pool
+    if _parse_pool is None:
+        if SCRAPE_PARSE_POOL == 'process':
+            # never fork: the parent runs resolver, logging and Playwright
+            # threads whose held locks a forked child would inherit
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _parse_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=multiprocessing.get_context(method),
+            )
+        else:
+            _parse_pool = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _parse_pool
+
+
+async def _run_parser(func, *args):
+    global _parse_pool
+    loop = asyncio.get_running_loop()
+    pool = _get_parse_pool()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except concurrent.futures.BrokenExecutor:
+        # a dead worker (e.g. OOM on a huge page) breaks the pool for good:
+        # replace it (once, even with many callers failing together) and retry
+        if _parse_pool is pool:
+            logger.warning("⚠️ Parse pool broken, starting a new one")
+            pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+        return await loop.run_in_executor(_get_parse_pool(), func, *args)
+
+
+def _traf_extract(html: str) -> Tuple[Optional[str], Optional[str]]:
+    """trafilatura body + title extraction (top-level so it pickles into the pool)."""
+    content = trafilatura.extract(html)
+    meta = trafilatura.extract_metadata(html)
+    return content, (meta.title if meta else None)
+
+
+async def _scrape_with_trafilatura(url: str) -> Dict:
     item = {"url": url, "title": None, "content": "", "status": "failed", "error": None}
     try:
-        r = requests.get(url, headers={'User-Agent': 'Mozilla/5.0 ... Chrome/130'}, timeout=18, allow_redirects=True)
+        r = await _get_http().get(url, timeout=18)
         r.raise_for_status()
-        content = trafilatura.extract(r.text)
-        meta = trafilatura.extract_metadata(r.text)
+        content, title = await _run_parser(_traf_extract, r.text)
         if content and len(content) >= 300:
             item.update({
                 'status': 'success',
                 'content': content.strip(),
-                'title': meta.title if meta else None
+                'title': title
             })
     except Exception as e:
         item['error'] = str(e)
     return item
 
 
-def _scrape_with_beautifulsoup(url: str) -> Dict:
-    item = {"url": url, "title": None, "content": "", "status": "failed", "error": None}
-    try:
-        r = requests.get(url, headers={'User-Agent': 'Mozilla/5.0 ...'}, timeout=15)
-        soup = BeautifulSoup(r.content, 'html.parser')
-        title = (soup.find('h1') or soup.find('title') or {}).get_text(' ', strip=True) or 'No title'
+# Page chrome dropped before extracting paragraphs (one DOM walk in either parser)
+_STRIP_TAGS = ['script', 'style', 'nav', 'footer', 'header', 'aside', 'iframe']
+_STRIP_SELECTOR = ','.join(_STRIP_TAGS)
+
+
+def _extract_with_selectolax(html: bytes) -> Tuple[str, str]:
+    tree = HTMLParser(html)
+    heading = tree.css_first('h1') or tree.css_first('title')
+    title = (heading.text(separator=' ', strip=True) if heading else '') or 'No title'
+
+    for bad in tree.css(_STRIP_SELECTOR):
+        bad.decompose()
+
+    body = tree.css_first('article') or tree.css_first('main') or tree.body
+    paras = body.css('p,div') if body else []
+    content = '\n\n'.join(t for t in (p.text(separator=' ', strip=True) for p in paras) if len(t) > 40)
+    return title, _WS.sub(' ', content).strip()
+
+
+def _extract_with_beautifulsoup(html: bytes) -> Tuple[str, str]:
+    soup = BeautifulSoup(html, 'html.parser')
+    title = (soup.find('h1') or soup.find('title') or {}).get_text(' ', strip=True) or 'No title'
 
-        for bad in soup(['script','style','nav','footer','header','aside','iframe']):
-            bad.decompose()
+    for bad in soup.find_all(_STRIP_TAGS):
+        bad.decompose()
 
-        body = soup.find('article') or soup.find('main') or soup.body
-        paras = body.find_all(['p','div']) if body else []
-        content = '\n\n'.join(t.strip() for t in (p.get_text(' ', strip=True) for p in paras) if len(t) > 40)
-        content = ' '.join(content.split())
+    body = soup.find('article') or soup.find('main') or soup.body
+    paras = body.find_all(['p','div']) if body else []
+    content = '\n\n'.join(t.strip() for t in (p.get_text(' ', strip=True) for p in paras) if len(t) > 40)
+    return title, _WS.sub(' ', content).strip()
+
+
+async def _scrape_with_html_parser(url: str) -> Dict:
+    """Last-resort static HTML scrape: selectolax (C/lexbor) when installed, else BeautifulSoup."""
+    item = {"url": url, "title": None, "content": "", "status": "failed", "error": None}
+    try:
+        r = await _get_http().get(url)
+        extract = _extract_with_selectolax if SELECTOLAX_AVAILABLE else _extract_with_beautifulsoup
+        title, content = await _run_parser(extract, r.content)
 
         if len(content) >= 300:
             item.update(status='success', title=title, content=content)
@@ -194,7 +515,14 @@ def _scrape_with_beautifulsoup(url: str) -> Dict:
 
 async def scrape_urls(urls: List[str], use_playwright: bool = True) -> List[Dict]:
     if use_playwright and PLAYWRIGHT_AVAILABLE:
-        return [await scrape_url(u, True) for u in urls]     # sequential
+        # pages share one browser; cap how many are open at once
+        sem = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+
+        async def _one(u):
+            async with sem:
+                return await scrape_url(u, True)
+
+        return await asyncio.gather(*(_one(u) for u in urls))
     else:
         return await asyncio.gather(*(scrape_url(u, False) for u in urls))
 
@@ -202,6 +530,13 @@ async def scrape_urls(urls: List[str], use_playwright: bool = True) -> List[Dict
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
     test_urls = ["https://www.bbc.com/news/technology"]
-    results = asyncio.run(scrape_urls(test_urls, use_playwright=True))
+
+    async def _main():
+        try:
+            return await scrape_urls(test_urls, use_playwright=True)
+        finally:
+            await close_scraper()
+
+    results = asyncio.run(_main())
     for r in results:
         print(f"\n{r['url']}\nStatus: {r['status']}\nTitle: {r.get('title')}\nLen: {len(r.get('content',''))}")
\ No newline at end of file
@@ -1,56 +1,131 @@
+import asyncio
 import os
+from contextlib import aclosing
+from typing import List, Optional
+import httpx
+import openai
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
 from dotenv import load_dotenv
 
 load_dotenv() 
 
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
 
-# configure small, fast model
-llm = ChatOpenAI(
-    model_name=os.environ.get('OPENAI_MODEL', 'gpt-4.1-nano'), 
-    temperature=0.1, 
-    openai_api_key=OPENAI_API_KEY
-)
+OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4.1-nano')
+
+# Shared keep-alive pool so each call doesn't pay a fresh TLS handshake to OpenAI.
+# Built lazily inside the running event loop (with the models and the request
+# cap that go with it) and torn down by close_summarizer().
+_http_client: Optional[httpx.AsyncClient] = None
+_llm = None
+_script_llm = None
+_OPENAI_SEM: Optional[asyncio.Semaphore] = None
+
+
+def _get_llms():
+    """Return (llm, script_llm), building the shared client on first use."""
+    global _http_client, _llm, _script_llm, _OPENAI_SEM
+    if _llm is None or _http_client.is_closed:
+        # built into locals first: if ChatOpenAI raises (e.g. no API key), the
+        # next call retries the whole setup instead of seeing half of it (the
+        # unused client holds no connections)
+        client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        # configure small, fast model
+        llm = ChatOpenAI(
+            model_name=OPENAI_MODEL,
+            temperature=0.1,
+            openai_api_key=OPENAI_API_KEY,
+            http_async_client=client,
+            max_retries=0,  # _call_openai is the only retry layer
+        )
+        script_llm = llm.bind(max_tokens=SCRIPT_MAX_TOKENS, stop=["\n\n\n"])
+        _http_client, _llm, _script_llm = client, llm, script_llm
+        _OPENAI_SEM = asyncio.Semaphore(OPENAI_CONCURRENCY)
+    return _llm, _script_llm
+
+
+async def close_summarizer():
+    """Close the shared OpenAI HTTP client (call once at process/app exit)."""
+    global _http_client, _llm, _script_llm, _OPENAI_SEM
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = _llm = _script_llm = _OPENAI_SEM = None
+
+
+# Prompts are plain format strings handed straight to the model: skips the
+# PromptTemplate validation / Runnable plumbing on every call.
 
 # Prompt for factual summary
-summary_prompt = PromptTemplate(
-    input_variables=["article_text"],
-    template=(
-        "You are a concise, factual summarizer.\n"
-        "Summarize the following article in neutral, factual language in up to 5 sentences."
-        " List the main facts and key numbers.\n\nArticle:\n{article_text}\n\nSummary:"
-    )
+_SUMMARY_TMPL = (
+    "You are a concise, factual summarizer.\n"
+    "Summarize the following article in neutral, factual language in up to 5 sentences."
+    " List the main facts and key numbers.\n\nArticle:\n{article_text}\n\nSummary:"
 )
 
-# Modern RunnableSequence syntax
-summary_chain = summary_prompt | llm
-
 # Prompt for converting summary to a 30-45s news script (80-120 words target)
-script_prompt = PromptTemplate(
-    input_variables=["headline", "summary"],
-    template=(
-        "You are a professional news writer.\n"
-        "Given this HEADLINE and SUMMARY, write a spoken news-anchor script suitable for a 30-45 second read (about 80-120 words).\n"
-        "Tone: professional, conversational, neutral. Start with a short headline line, then two short paragraphs, end with a 1-sentence closing.\n\n"
-        "HEADLINE: {headline}\n\nSUMMARY: {summary}\n\nSCRIPT:"
-    )
+_SCRIPT_TMPL = (
+    "You are a professional news writer.\n"
+    "Given this HEADLINE and SUMMARY, write a spoken news-anchor script suitable for a 30-45 second read (about 80-120 words).\n"
+    "Tone: professional, conversational, neutral. Start with a short headline line, then two short paragraphs, end with a 1-sentence closing.\n\n"
+    "HEADLINE: {headline}\n\nSUMMARY: {summary}\n\nSCRIPT:"
 )
 
-# Modern RunnableSequence syntax
-script_chain = script_prompt | llm
+# Scripts target 80-120 words: cap the completion so an overrun can't drag on
+SCRIPT_MAX_TOKENS = 200
+SCRIPT_WORD_LIMIT = 130
+
+
+# Process-wide cap on in-flight OpenAI requests, shared by every caller
+OPENAI_CONCURRENCY = int(os.environ.get('OPENAI_CONCURRENCY', 8))
+RATE_LIMIT_RETRIES = 3
+
+
+async def _call_openai(fn):
+    """Run one OpenAI call under the shared cap, waiting out 429s (Retry-After)."""
+    _get_llms()
+    async with _OPENAI_SEM:
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                return await fn()
+            except openai.RateLimitError as e:
+                # an exhausted quota is also a 429, but waiting never fixes it
+                if attempt == RATE_LIMIT_RETRIES or getattr(e, 'code', None) == 'insufficient_quota':
+                    raise
+                retry_after = e.response.headers.get('retry-after', '5') if e.response is not None else '5'
+                try:
+                    delay = float(retry_after)
+                except ValueError:
+                    delay = 5.0
+                await asyncio.sleep(delay)
 
 
 async def summarize_article(article_text: str) -> str:
     """Return a concise, factual summary of an article (async)."""
-    response = await summary_chain.ainvoke({"article_text": article_text})
+    response = await _call_openai(lambda: _get_llms()[0].ainvoke(_SUMMARY_TMPL.format(article_text=article_text)))
     # Extract text from AIMessage object
     return response.content if hasattr(response, 'content') else str(response)
 
 
+async def summarize_articles(article_texts: List[str]) -> List[str]:
+    """Summarize many articles concurrently, up to OPENAI_CONCURRENCY at a time (async)."""
+    return list(await asyncio.gather(*(summarize_article(t) for t in article_texts)))
+
+
 async def generate_script(headline: str, summary: str) -> str:
     """Return a 30-45s news-anchor style script (async)."""
-    response = await script_chain.ainvoke({"headline": headline, "summary": summary})
-    # Extract text from AIMessage object
-    return response.content if hasattr(response, 'content') else str(response)
\ No newline at end of file
+    async def stream() -> str:
+        # Stream tokens and stop at the first sentence end past the word limit
+        # (aclosing: breaking out early still closes the upstream HTTP stream)
+        script = ''
+        async with aclosing(_get_llms()[1].astream(_SCRIPT_TMPL.format(headline=headline, summary=summary))) as chunks:
+            async for chunk in chunks:
+                script += chunk.content if hasattr(chunk, 'content') else str(chunk)
+                if len(script.split()) >= SCRIPT_WORD_LIMIT and script.rstrip().endswith(('.', '!', '?')):
+                    break
+        return script
+
+    return await _call_openai(stream)
@@ -1,93 +1,403 @@
 import os
 import httpx
+import orjson
 import asyncio
-from typing import Optional, Dict
+import hashlib
+import hmac
+import random
+import re
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Optional, Dict, List, Tuple, Union
+from urllib.parse import quote
 import logging
+from dotenv import load_dotenv
+
+load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 # HeyGen Configuration
-HEYGEN_API_KEY = os.environ.get('HEYGEN_API_KEY', 'sk_V2_hgu_kaBycQjfHtU_rdIaOx4ctdlgz4np1eJChU4ZsP2Jtr0c')
-HEYGEN_GENERATE_URL = 'https://api.heygen.com/v2/video/generate'
-HEYGEN_STATUS_URL = 'https://api.heygen.com/v1/video_status.get'
+HEYGEN_API_KEY = os.environ.get('HEYGEN_API_KEY')
+if not HEYGEN_API_KEY:
+    raise RuntimeError('HEYGEN_API_KEY must be set')
+HEYGEN_BASE_URL = 'https://api.heygen.com'
+HEYGEN_GENERATE_PATH = '/v2/video/generate'
+HEYGEN_STATUS_PATH = '/v1/video_status.get'
+
+# Status polling: sleep POLL_OVERHEAD x elapsed between polls, clamped to
+# [POLL_MIN_DELAY, POLL_MAX_DELAY] seconds, so polling adds ~10% to the wait
+POLL_MIN_DELAY = float(os.environ.get('HEYGEN_POLL_MIN', 2.0))
+POLL_MAX_DELAY = float(os.environ.get('HEYGEN_POLL_MAX', 30.0))
+POLL_OVERHEAD = float(os.environ.get('HEYGEN_POLL_OVERHEAD', 0.10))
+
+# When set, HeyGen POSTs the finished job here (see main.heygen_webhook)
+# instead of us polling the status endpoint. The webhook is public, so the
+# URL we hand HeyGen carries HEYGEN_WEBHOOK_SECRET as ?token=... and the
+# endpoint rejects any call without it.
+HEYGEN_CALLBACK_URL = os.environ.get('HEYGEN_CALLBACK_URL')
+HEYGEN_WEBHOOK_SECRET = os.environ.get('HEYGEN_WEBHOOK_SECRET')
+if HEYGEN_CALLBACK_URL and not HEYGEN_WEBHOOK_SECRET:
+    raise RuntimeError('HEYGEN_WEBHOOK_SECRET must be set when HEYGEN_CALLBACK_URL is')
+_SIGNED_CALLBACK_URL = (
+    f"{HEYGEN_CALLBACK_URL}{'&' if '?' in HEYGEN_CALLBACK_URL else '?'}token={quote(HEYGEN_WEBHOOK_SECRET)}"
+    if HEYGEN_CALLBACK_URL else None
+)
 
 # Your avatar ID
 AVATAR_ID = os.environ.get('HEYGEN_AVATAR_ID', '967948d61edc46c8854d639ea170aab9')
 
+# Named voices accepted by build_did_payload(voice=...); read-only at runtime
+VOICES = MappingProxyType({
+    'male_professional': '2d5b0e6cf36349c0b48b282c8e2ff88b',
+    'male_casual': 'baf1c52778f0421585788312c4425a0e',
+    'male_news': '40104aff703f4760bc2452535e0f9644',
+    'female_professional': '1bd001e7e50f421d891986aad5158bc8',
+    'female_casual': 'e7dd8cf4292f4c3b9e4c4c5e3f6c1e77',
+    'female_news': 'af90abcf592b4e0e9d252eb5b5c0c3d5',
+})
+DEFAULT_VOICE_ID = os.environ.get('HEYGEN_VOICE_ID', 'f38a635bee7a4d1f9b0a654a31d050d2')
 
-async def generate_video(payload: dict, max_wait: int = 300) -> dict:
-    """Generate video using HeyGen API."""
-    if not HEYGEN_API_KEY:
-        raise RuntimeError('HEYGEN_API_KEY must be set')
-
-    headers = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "x-api-key": HEYGEN_API_KEY
-    }
+# A raw HeyGen voice ID (32 lowercase hex chars)
+_VOICE_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def resolve_voice(voice: Optional[str]) -> str:
+    """Map a VOICES name or raw voice ID to a voice ID; None means the default."""
+    if not voice:
+        return DEFAULT_VOICE_ID
+    voice_id = VOICES.get(voice)
+    if voice_id:
+        return voice_id
+    if _VOICE_ID_RE.match(voice):
+        return voice
+    raise ValueError(f"Unknown voice '{voice}': use one of {', '.join(VOICES)} or a 32-char voice ID")
+
+# One client for every HeyGen call, so video jobs share a warm TLS connection;
+# built lazily inside the running event loop
+_CLIENT: Optional[httpx.AsyncClient] = None
+_CLIENT_LOCK = asyncio.Lock()
+
+
+async def _get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    async with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT.is_closed:
+            _CLIENT = httpx.AsyncClient(
+                http2=True,
+                base_url=HEYGEN_BASE_URL,
+                headers={
+                    "x-api-key": HEYGEN_API_KEY,
+                    "accept": "application/json",
+                    "content-type": "application/json",
+                },
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=60.0),
+                timeout=httpx.Timeout(60.0, connect=10.0),
+            )
+        return _CLIENT
+
+
+async def close_heygen_client():
+    """Close the shared HeyGen client (call once at process/app exit)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+# Max HeyGen jobs in flight at once; more just trips their rate limits
+HEYGEN_CONCURRENCY = int(os.environ.get('HEYGEN_CONCURRENCY', 2))
+_HEYGEN_SEM = asyncio.Semaphore(HEYGEN_CONCURRENCY)
+
+
+# Finished renders keyed by payload hash: identical (script, avatar, voice)
+# requests reuse the earlier video instead of paying for a new one
+VIDEO_CACHE_SIZE = 128
+VIDEO_CACHE_PATH = os.environ.get('HEYGEN_CACHE_PATH', os.path.join('.cache', 'heygen'))
+VIDEO_CACHE_TTL = 7 * 86400
+_video_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def _payload_key(payload: dict) -> str:
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _memory_get(key: str) -> Optional[dict]:
+    result = _video_cache.get(key)
+    if result is not None:
+        _video_cache.move_to_end(key)
+    return result
 
+
+def _memory_put(key: str, result: dict) -> None:
+    _video_cache[key] = result
+    _video_cache.move_to_end(key)
+    while len(_video_cache) > VIDEO_CACHE_SIZE:
+        _video_cache.popitem(last=False)
+
+
+# The shelve file is only touched from worker threads (asyncio.to_thread);
+# dbm isn't safe for concurrent access, so they take turns
+_shelf_lock = threading.Lock()
+
+
+def _disk_get(key: str) -> Optional[dict]:
     try:
-        async with httpx.AsyncClient(timeout=60) as client:
-            logger.info("🎬 Creating HeyGen video...")
-            
-            # Create video
-            resp = await client.post(HEYGEN_GENERATE_URL, json=payload, headers=headers)
+        with _shelf_lock, shelve.open(VIDEO_CACHE_PATH) as db:
+            entry = db.get(key)
+    except Exception as e:
+        logger.debug("HeyGen cache read failed: %s", e)
+        return None
+    if entry and time.time() - entry[0] < VIDEO_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+def _disk_put(key: str, result: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(VIDEO_CACHE_PATH) or '.', exist_ok=True)
+        with _shelf_lock, shelve.open(VIDEO_CACHE_PATH) as db:
+            db[key] = (time.time(), result)
+    except Exception as e:
+        logger.debug("HeyGen cache write failed: %s", e)
+
+
+# Renders in flight by payload key, so identical concurrent requests share one job
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+# Jobs waiting on a webhook, keyed by video_id (resolved by resolve_callback)
+_pending: Dict[str, asyncio.Future] = {}
+
+# Callbacks that arrive before their job registers (fast or cached renders can
+# finish while the create response is still in flight), kept briefly by video_id
+CALLBACK_BUFFER_TTL = 600
+CALLBACK_BUFFER_SIZE = 256
+_early_callbacks: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+
+def verify_callback_token(token: Optional[str]) -> bool:
+    """True if `token` matches HEYGEN_WEBHOOK_SECRET (constant-time compare)."""
+    if not (HEYGEN_WEBHOOK_SECRET and token):
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), HEYGEN_WEBHOOK_SECRET.encode('utf-8'))
+
+
+def _callback_event(body: dict) -> dict:
+    event = body.get('event_data') or body.get('data') or {}
+    return event if isinstance(event, dict) else {}
+
+
+def resolve_callback(body: dict) -> bool:
+    """Hand a HeyGen webhook body to the job waiting on it; False if none is (yet)."""
+    video_id = _callback_event(body).get('video_id')
+    if not video_id:
+        return False
+    fut = _pending.pop(video_id, None)
+    if fut is not None and not fut.done():
+        fut.set_result(body)
+        return True
+    _early_callbacks[video_id] = (time.monotonic(), body)
+    while len(_early_callbacks) > CALLBACK_BUFFER_SIZE:
+        _early_callbacks.popitem(last=False)
+    return False
+
+
+def _take_early_callback(video_id: str) -> Optional[dict]:
+    entry = _early_callbacks.pop(video_id, None)
+    if entry and time.monotonic() - entry[0] < CALLBACK_BUFFER_TTL:
+        return entry[1]
+    return None
+
+
+# Transient HeyGen errors are retried with backoff instead of abandoning the job.
+# Creates retry only when HeyGen definitely didn't start a job (429, 503): a
+# 500/502/504 may come from a gateway after the job was created upstream, and
+# retrying it could bill a second render.
+HTTP_RETRIES = 5
+RETRY_MAX_DELAY = 60.0
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+_CREATE_RETRY_STATUSES = frozenset((429, 503))
+
+
+async def _send(client: httpx.AsyncClient, method: str, url: str, retry_on=_RETRY_STATUSES,
+                deadline: Optional[float] = None, **kwargs) -> httpx.Response:
+    """Send one request, retrying `retry_on` statuses (Retry-After or 2**n + jitter).
+
+    Waits are capped at RETRY_MAX_DELAY and never run past `deadline`
+    (a time.monotonic() value); once there's no budget left the error is raised.
+    """
+    for attempt in range(HTTP_RETRIES):
+        resp = await client.request(method, url, **kwargs)
+        if resp.status_code not in retry_on or attempt == HTTP_RETRIES - 1:
             resp.raise_for_status()
-            job_data = resp.json()
-            
-            video_id = job_data.get('data', {}).get('video_id')
-            if not video_id:
-                raise RuntimeError(f"No video_id: {job_data}")
-            
-            logger.info(f"✅ Video job created: {video_id}")
-            
-            # Poll for completion
-            elapsed = 0
-            poll_interval = 10
-            
-            while elapsed < max_wait:
-                await asyncio.sleep(poll_interval)
-                elapsed += poll_interval
-                
-                status_resp = await client.get(
-                    HEYGEN_STATUS_URL,
-                    params={'video_id': video_id},
-                    headers=headers
-                )
-                status_resp.raise_for_status()
-                status_data = status_resp.json()
-                
-                status = status_data.get('data', {}).get('status')
-                logger.info(f"⏳ Status: {status} ({elapsed}s)")
-                
-                if status == 'completed':
-                    video_url = status_data.get('data', {}).get('video_url')
-                    logger.info(f"✅ Video ready: {video_url}")
-                    return {
-                        'id': video_id,
-                        'status': 'done',
-                        'result_url': video_url,
-                        'video_url': video_url,
-                        'duration': status_data.get('data', {}).get('duration', 0),
-                        'provider': 'heygen'
-                    }
-                elif status == 'failed':
-                    raise RuntimeError(f"Video failed: {status_data.get('data', {}).get('error')}")
-            
-            raise TimeoutError(f"Timed out after {max_wait}s")
-            
+            return resp
+        try:
+            delay = float(resp.headers.get('retry-after', 2 ** attempt))
+        except ValueError:
+            delay = 2 ** attempt
+        delay = min(delay + random.random(), RETRY_MAX_DELAY)
+        if deadline is not None:
+            delay = min(delay, deadline - time.monotonic())
+            if delay <= 0:
+                resp.raise_for_status()
+        logger.warning("⚠️ HeyGen %s on %s, retrying in %.0fs", resp.status_code, url, delay)
+        await asyncio.sleep(delay)
+
+
+def _next_delay(elapsed: float, overhead_rate: float = POLL_OVERHEAD,
+                lo: float = POLL_MIN_DELAY, hi: float = POLL_MAX_DELAY) -> float:
+    return max(lo, min(hi, overhead_rate * elapsed))
+
+
+async def generate_video(payload: dict, max_wait: int = 300) -> dict:
+    """Generate video using HeyGen API (identical payloads reuse the cached video)."""
+    key = _payload_key(payload)
+    cached = _memory_get(key)
+    if cached is not None:
+        logger.info("♻️ Reusing cached video: %s", cached.get('video_url'))
+        return dict(cached)
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_cached_render(key, payload, max_wait))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shielded: one caller giving up doesn't cancel a render others wait on
+    return dict(await asyncio.shield(task))
+
+
+async def _cached_render(key: str, payload: dict, max_wait: int) -> dict:
+    cached = await asyncio.to_thread(_disk_get, key)
+    if cached is not None:
+        logger.info("♻️ Reusing cached video: %s", cached.get('video_url'))
+        _memory_put(key, cached)
+        return cached
+
+    async with _HEYGEN_SEM:
+        result = await _generate_video(payload, max_wait)
+    _memory_put(key, result)
+    await asyncio.to_thread(_disk_put, key, result)
+    return result
+
+
+async def generate_videos(payloads: List[dict], max_wait: int = 300) -> List[Union[dict, BaseException]]:
+    """Generate several videos concurrently (up to HEYGEN_CONCURRENCY in flight).
+
+    Results come back in input order; a failed job yields its exception
+    instead of cancelling the rest of the batch.
+    """
+    return list(await asyncio.gather(*(generate_video(p, max_wait) for p in payloads), return_exceptions=True))
+
+
+async def _generate_video(payload: dict, max_wait: int) -> dict:
+    deadline = time.monotonic() + max_wait
+    try:
+        logger.info("🎬 Creating HeyGen video...")
+        
+        # Create video (the cache key stays on the caller's payload)
+        if HEYGEN_CALLBACK_URL:
+            payload = {**payload, 'callback_url': _SIGNED_CALLBACK_URL}
+        client = await _get_client()
+        resp = await _send(client, 'POST', HEYGEN_GENERATE_PATH, retry_on=_CREATE_RETRY_STATUSES,
+                           deadline=deadline, content=orjson.dumps(payload))
+        job_data = orjson.loads(resp.content)
+        
+        video_id = (job_data.get('data') or {}).get('video_id')
+        if not video_id:
+            raise RuntimeError(f"No video_id: {job_data}")
+        
+        logger.info("✅ Video job created: %s", video_id)
+
+        if HEYGEN_CALLBACK_URL:
+            return await _await_callback(client, video_id, max_wait)
+        return await _poll_video(client, video_id, max_wait)
+
     except httpx.HTTPStatusError as e:
         raise RuntimeError(f"HeyGen API error: {e.response.status_code} - {e.response.text}")
 
 
-def build_did_payload(script_text: str, model: Optional[str] = 'expressive', **kwargs) -> dict:
+def _video_result(video_id: str, video_url: Optional[str], duration) -> dict:
+    logger.info("✅ Video ready: %s", video_url)
+    return {
+        'id': video_id,
+        'status': 'done',
+        'result_url': video_url,
+        'video_url': video_url,
+        'duration': duration or 0,
+        'provider': 'heygen'
+    }
+
+
+async def _await_callback(client: httpx.AsyncClient, video_id: str, max_wait: int) -> dict:
+    body = _take_early_callback(video_id)
+    if body is None:
+        fut = asyncio.get_running_loop().create_future()
+        _pending[video_id] = fut
+        try:
+            body = await asyncio.wait_for(fut, timeout=max_wait)
+        except asyncio.TimeoutError:
+            # the callback may have been lost: ask once before giving up
+            logger.warning("⚠️ No callback for %s after %ss, checking status", video_id, max_wait)
+            try:
+                return await _poll_video(client, video_id, 0)
+            except TimeoutError:
+                raise TimeoutError(f"Timed out after {max_wait}s") from None
+        finally:
+            _pending.pop(video_id, None)
+
+    event = _callback_event(body)
+    if body.get('event_type') == 'avatar_video.fail' or event.get('status') == 'failed':
+        raise RuntimeError(f"Video failed: {event.get('msg') or event.get('error')}")
+    return _video_result(video_id, event.get('url') or event.get('video_url'), event.get('duration'))
+
+
+async def _poll_video(client: httpx.AsyncClient, video_id: str, max_wait: int) -> dict:
+    # Poll for completion: check right away (cached inputs can finish in a
+    # second or two), then back off in proportion to how long it's taken
+    start = time.monotonic()
+    
+    while True:
+        elapsed = int(time.monotonic() - start)
+        
+        t0 = time.monotonic()
+        status_resp = await _send(client, 'GET', HEYGEN_STATUS_PATH, deadline=start + max_wait,
+                                  params={'video_id': video_id})
+        req_time = time.monotonic() - t0
+        data = orjson.loads(status_resp.content).get('data') or {}
+        
+        status = data.get('status')
+        logger.info("⏳ Status: %s (%ds)", status, elapsed)
+        
+        if status == 'completed':
+            return _video_result(video_id, data.get('video_url'), data.get('duration'))
+        elif status == 'failed':
+            raise RuntimeError(f"Video failed: {data.get('error')}")
+        
+        elapsed = time.monotonic() - start
+        if elapsed >= max_wait:
+            break
+        # the status call itself counts towards the interval
+        await asyncio.sleep(max(0.0, min(_next_delay(elapsed) - req_time, max_wait - elapsed)))
+    
+    raise TimeoutError(f"Timed out after {max_wait}s")
+
+
+def build_did_payload(script_text: str, model: Optional[str] = 'expressive', voice: Optional[str] = None, **kwargs) -> dict:
     """
     Build HeyGen payload - EXACTLY as HeyGen API expects it.
+    `voice` is a VOICES name or a raw voice ID (default: HEYGEN_VOICE_ID).
     """
     avatar_id = kwargs.get('avatar_id', AVATAR_ID)
-    
-    # THIS IS THE CORRECT PAYLOAD STRUCTURE
-    payload = {
+    voice_id = resolve_voice(voice)
+    logger.info("🎤 Using voice: %s (ID: %s)", voice or 'default', voice_id)
+
+    # A fresh literal is the cheapest way to build this: deep-copying or
+    # re-parsing a cached template costs more than the dict displays do
+    return {
         "caption": False,
         "video_inputs": [
             {
@@ -99,7 +409,7 @@ def build_did_payload(script_text: str, model: Optional[str] = 'expressive', **k
                 "voice": {
                     "type": "text",
                     "input_text": script_text,  # ← YOUR SCRIPT GOES HERE
-                    "voice_id": "f38a635bee7a4d1f9b0a654a31d050d2"
+                    "voice_id": voice_id
                 },
                 "background": {
                     "type": "color",
@@ -112,8 +422,6 @@ def build_did_payload(script_text: str, model: Optional[str] = 'expressive', **k
             "height": 720
         }
     }
-    
-    return payload
 
 
 # QUICK TEST
@@ -124,11 +432,31 @@ async def test():
     print("Testing HeyGen...")
     print(f"Script: {script}")
     
-    result = await generate_video(payload)
+    try:
+        result = await generate_video(payload)
+    finally:
+        await close_heygen_client()
     print(f"✅ Video URL: {result['video_url']}")
     return result
 
 
+async def test_voices():
+    """Render the same line with every named voice, all jobs in parallel."""
+    script = "Hello, this is a quick voice test for the news pipeline."
+    names = list(VOICES)
+
+    try:
+        results = await generate_videos([build_did_payload(script, voice=name) for name in names])
+    finally:
+        await close_heygen_client()
+    for name, result in zip(names, results):
+        if isinstance(result, BaseException):
+            print(f"❌ {name}: {result}")
+        else:
+            print(f"✅ {name}: {result['video_url']}")
+    return results
+
+
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO)
     asyncio.run(test())
\ No newline at end of file